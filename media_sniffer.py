@@ -2,15 +2,21 @@ import subprocess
 import yt_dlp
 from urllib.parse import urlparse
 import urllib3
-from typing import Any, Dict, Optional, Tuple, List
+from typing import Any, Dict, Optional, Set, Tuple, List
 from pathlib import Path
-from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
 import time
 import os
+import shutil
 import json
 import threading
+import collections
+import functools
+import itertools
 import ttkbootstrap as ttk
 from tkinter import filedialog, messagebox
 import tkinter as tk
@@ -18,6 +24,21 @@ import undetected_chromedriver as uc
 import warnings
 from requests.exceptions import RequestsDependencyWarning
 warnings.filterwarnings("ignore", category=RequestsDependencyWarning)
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+try:
+    import winreg
+except ImportError:  # 非 Windows
+    winreg = None
 # 嚴格遵守：不使用萬用字元
 
 # --- 設定與常數 ---
@@ -29,6 +50,53 @@ SETTINGS_FILE = CONFIG_DIR / "settings.json"
 # 關閉 SSL 警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# 共用連線池 (keep-alive，避免每次探測都重新握手)
+SESSION = requests.Session()
+# 只重試建立連線失敗 (尚未送出請求)；讀取逾時不重試，失效連結最多等一次 timeout
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=64,
+                            max_retries=Retry(total=1, connect=1, read=0,
+                                              backoff_factor=0.1))
+SESSION.mount("http://", _HTTP_ADAPTER)
+SESSION.mount("https://", _HTTP_ADAPTER)
+VALIDITY_MAX_WORKERS = 16
+SNIFF_POLL_INTERVAL = 0.25
+SNIFF_POLL_INTERVAL_BUSY = 0.05
+DRIVER_POOL_SIZE = 2
+DRIVER_IDLE_TIMEOUT = 300
+CHROME_VER_TTL = 24 * 3600
+PROGRESS_MIN_INTERVAL = 0.25
+UI_DRAIN_INTERVAL_MS = 50
+UI_DRAIN_BATCH = 200
+PROGRESS_PUMP_INTERVAL_MS = 100
+SCROLL_SETTLE_SEC = 0.15  # 捲動停止這麼久後才補上延後的狀態更新
+SCROLL_FLUSH_INTERVAL_MS = 50
+ROW_INSERT_BATCH = 500
+ROW_LOAD_AHEAD = 0.9  # 可視範圍底部超過此比例時再補插下一批列
+LOG_FLUSH_INTERVAL_MS = 100
+LOG_MAX_LINES = 2000
+LOG_TRIM_SLACK = 500  # 超出上限這麼多行才整批刪除，分攤刪除成本
+PROBE_PREFIX_BYTES = 16384
+NOT_PLAYLIST_REASON = "非播放清單"
+YDL_POOL_SIZE = 4
+
+# 預先編譯常用正規表示式 (進度回呼、標題編輯等熱路徑)
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+_PCT_RE = re.compile(r'[^0-9.]')
+_BRACKETS_RE = re.compile(r'[《【\[(「"“（](.*?)[》】\])」"”）]')
+_SPLIT_RE = re.compile(r'[|\-｜_：\[\]【】()（）《》\s]+')
+_UNSAFE_FN_RE = re.compile(r'[\\/*?:"<>|]')
+_CHROME_UNIX_RE = re.compile(r'Chrome\s+(\d+)')
+# 播放清單探測 (bytes)：主清單標籤與每段 #EXTINF 的時長欄位
+_M3U_MASTER_RE = re.compile(rb'^#EXT-X-STREAM-INF', re.MULTILINE)
+_M3U_EXTINF_RE = re.compile(rb'^#EXTINF:([^,\r\n]*)', re.MULTILINE)
+
+# 嗅探時排除的廣告/追蹤/分片網址關鍵字，合併成單一正規表示式一次掃描
+SNIFF_BLOCKLIST = ("doubleclick", "adsr", "litix", "segment", "favicon")
+_BLOCK_RE = re.compile("|".join(map(re.escape, SNIFF_BLOCKLIST)))
+# 效能日誌原始字串的預先過濾標記，兩者皆出現才值得 JSON 解析
+_CDP_URL_MARK = ".m3u8"
+_CDP_METHOD_MARK = '"Network.requestWillBeSent"'
+
 THEME_MAP = {
     "Cosmo (現代白)": "cosmo",
     "Flatly (扁平化)": "flatly",
@@ -43,6 +111,56 @@ THEME_MAP = {
     "Vapor (蒸汽波)": "vapor"
 }
 
+LIGHT_THEMES = frozenset({"cosmo", "flatly", "journal", "litera", "minty", "lumen"})
+# 日誌區 (背景, 前景)，依是否為淺色主題索引
+LOG_COLORS = {True: ("#f8f9fa", "#333333"), False: ("#2b2b2b", "#dddddd")}
+
+# 狀態文字 → 列標籤，依序比對，第一個命中者為準
+STATUS_TAGS = (
+    ("完成", "completed"),
+    ("失效", "invalid"),
+    ("錯誤", "invalid"),
+    ("已修復", "repaired"),
+    ("%", "downloading"),
+    ("正在", "downloading"),
+    ("停止", "stopped"),
+)
+
+
+_STATUS_KEY_RE = re.compile("|".join(re.escape(k) for k, _ in STATUS_TAGS))
+
+CHECK_GLYPHS = ("☐", "☑")  # 以 bool 索引
+
+
+@functools.lru_cache(maxsize=256)
+def _status_to_tag(status: str) -> str:
+    # 多數狀態 ("", "OK", "已匯入", "檢查中..." 等) 不含任何關鍵字，一次掃描即可排除
+    if not _STATUS_KEY_RE.search(status):
+        return ""
+    for key, tag in STATUS_TAGS:
+        if key in status:
+            return tag
+    return ""
+
+
+TREE_COLUMNS = ("check", "title", "status", "m3u8")
+
+# Treeview 樣式只需建立一次
+TREE_STYLE = {"rowheight": 30, "font": ("Microsoft JhengHei UI", 10)}
+TREE_HEADING_STYLE = {"font": ("Microsoft JhengHei UI", 10, "bold"),
+                      "borderwidth": 3, "relief": "raised"}
+# 列標籤 → (前景色, 淺色主題背景, 深色主題背景)
+TAG_COLORS = {
+    "downloading": ("#28a745", None, None),
+    "error": ("#dc3545", None, None),
+    "stopped": ("#fd7e14", None, None),
+    "completed": ("#007bff", None, None),
+    "invalid": ("#dc3545", "#ffe6e6", "#4a1b1b"),
+    "repaired": ("#00bc8c", None, None),
+    "checked": (None, "#e9ecef", "#444"),
+}
+_TREE_COL_POS = {c: i for i, c in enumerate(TREE_COLUMNS)}
+
 DEFAULT_SETTINGS = {
     "download_path": str(Path.home() / "Downloads"),
     "browser_width": 1280,
@@ -55,43 +173,55 @@ DEFAULT_SETTINGS = {
 # --- M3U 處理器 ---
 
 
+def _m3u_decode(raw: bytes) -> str:
+    # 整份只解碼一次；UTF-8 失敗時整份改用 GBK，不會出現逐欄混用編碼
+    try:
+        return raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return raw.decode("gbk", errors="replace")
+
+
+def _m3u_on_ori_url(item: Dict[str, Any], rest: str) -> None:
+    item["original_url"] = rest.strip()
+
+
+def _m3u_on_extinf(item: Dict[str, Any], rest: str) -> None:
+    _, sep, title = rest.partition(",")
+    item["title"] = title.strip() if sep else "未命名影片"
+
+
+def _m3u_on_vlcopt(item: Dict[str, Any], rest: str) -> None:
+    _, sep, ref = rest.partition("http-referrer=")
+    if sep:
+        item.setdefault("headers", {})["Referer"] = ref.strip()
+
+
+M3U_TAG_HANDLERS = {
+    "#EXT-ORI-URL": _m3u_on_ori_url,
+    "#EXTINF": _m3u_on_extinf,
+    "#EXTVLCOPT": _m3u_on_vlcopt,
+}
+
+# 標題寫入 #EXTINF 前去除換行，單次 translate 取代連續 replace
+_M3U_TITLE_TABLE = str.maketrans({"\n": " ", "\r": None})
+
+
 class M3UHandler:
     @staticmethod
     def parse_file(filepath: str) -> List[Dict[str, Any]]:
         items = []
-        current_item = {}
-
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-        except UnicodeDecodeError:
-            with open(filepath, 'r', encoding='gbk') as f:
-                lines = f.readlines()
-
-        for line in lines:
-            line = line.strip()
+        current_item: Dict[str, Any] = {}
+
+        # 一次讀入、一次解碼 (utf-8-sig 順便去掉 BOM，否則首行 #EXTM3U 會被誤判為網址)，
+        # 不用因編碼錯誤重讀檔案，再以 splitlines 切行
+        with open(filepath, 'rb') as f:
+            text = _m3u_decode(f.read())
+        for raw in text.splitlines():
+            line = raw.strip()
             if not line:
                 continue
 
-            if line.startswith("#EXT-ORI-URL:"):
-                current_item["original_url"] = line.split(":", 1)[1].strip()
-
-            elif line.startswith("#EXTINF:"):
-                parts = line.split(",", 1)
-                if len(parts) > 1:
-                    current_item["title"] = parts[1].strip()
-                else:
-                    current_item["title"] = "未命名影片"
-
-            elif line.startswith("#EXTVLCOPT:"):
-                opt = line.split(":", 1)[1]
-                if "http-referrer=" in opt:
-                    ref = opt.split("http-referrer=", 1)[1].strip()
-                    if "headers" not in current_item:
-                        current_item["headers"] = {}
-                    current_item["headers"]["Referer"] = ref
-
-            elif not line.startswith("#"):
+            if line[0] != "#":
                 current_item["m3u8"] = line
                 if "title" not in current_item:
                     current_item["title"] = f"Imported_{len(items)+1}"
@@ -100,108 +230,178 @@ class M3UHandler:
 
                 items.append(current_item)
                 current_item = {}
+                continue
+
+            tag, sep, rest = line.partition(":")
+            handler = M3U_TAG_HANDLERS.get(tag)
+            if handler and sep:
+                handler(current_item, rest)
 
         return items
 
     @staticmethod
     def save_file(filepath: str, data_list: List[Dict[str, Any]]):
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write("#EXTM3U\n")
-            for item in data_list:
-                m3u8_url = item.get("m3u8", "")
-                if not m3u8_url:
-                    continue
+        # 先組好整份內容再一次寫入，避免每項多次 write 呼叫
+        parts = ["#EXTM3U\n"]
+        append_ = parts.append
+        for item in data_list:
+            m3u8_url = item.get("m3u8", "")
+            if not m3u8_url:
+                continue
 
-                ori_url = item.get("original_url")
-                if ori_url:
-                    f.write(f"#EXT-ORI-URL:{ori_url}\n")
+            ori_url = item.get("original_url")
+            if ori_url:
+                append_(f"#EXT-ORI-URL:{ori_url}\n")
 
-                title = item.get("title", "Unknown Title")
-                title = title.replace("\n", " ").replace("\r", "")
-                f.write(f"#EXTINF:-1,{title}\n")
+            title = item.get("title", "Unknown Title").translate(_M3U_TITLE_TABLE)
+            append_(f"#EXTINF:-1,{title}\n")
 
-                headers = item.get("headers", {})
-                referer = None
-                for k, v in headers.items():
-                    if k.lower() == "referer":
-                        referer = v
-                        break
+            headers = item.get("headers") or {}
+            referer = next((v for k, v in headers.items()
+                            if k.lower() == "referer"), None)
+            if referer:
+                append_(f"#EXTVLCOPT:http-referrer={referer}\n")
 
-                if referer:
-                    f.write(f"#EXTVLCOPT:http-referrer={referer}\n")
+            append_(f"{m3u8_url}\n")
 
-                f.write(f"{m3u8_url}\n")
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write("".join(parts))
+
+
+def _read_json_file(path: str) -> List[Dict[str, Any]]:
+    # 在背景執行緒完整驗證，主執行緒只會拿到可直接加入列表的項目
+    with open(path, 'rb') as f:
+        data = json_loads(f.read())
+    if not isinstance(data, list):
+        raise ValueError("檔案內容不是項目列表")
+    for n, item in enumerate(data, 1):
+        if not isinstance(item, dict):
+            raise ValueError(f"第 {n} 筆不是物件")
+        for key in ("title", "m3u8"):
+            if not isinstance(item.get(key), str):
+                raise ValueError(f"第 {n} 筆缺少 {key} 欄位")
+        if not isinstance(item.get("status", ""), str):
+            raise ValueError(f"第 {n} 筆的 status 不是文字")
+    return data
 
 # --- 輔助函式 ---
 
 
+# 設定檔內容依 mtime 快取，檔案未變更時不重新讀取與解析
+_SETTINGS_CACHE: Dict[str, Any] = {"mtime": None, "data": None}
+_SETTINGS_LOCK = threading.Lock()
+
+
 def load_settings() -> Dict[str, Any]:
-    if SETTINGS_FILE.exists():
+    with _SETTINGS_LOCK:
         try:
-            with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                for k, v in DEFAULT_SETTINGS.items():
-                    if k not in data:
-                        data[k] = v
-                return data
-        except Exception:
+            mtime = SETTINGS_FILE.stat().st_mtime_ns
+        except OSError:
             return DEFAULT_SETTINGS.copy()
-    return DEFAULT_SETTINGS.copy()
+        if _SETTINGS_CACHE["mtime"] != mtime:
+            try:
+                with open(SETTINGS_FILE, 'rb') as f:
+                    data = json_loads(f.read())
+                if not isinstance(data, dict):
+                    raise ValueError("settings root is not an object")
+            except Exception:
+                return DEFAULT_SETTINGS.copy()
+            _SETTINGS_CACHE.update(mtime=mtime, data=data)
+        # 回傳副本，呼叫端可自由修改
+        return {**DEFAULT_SETTINGS, **_SETTINGS_CACHE["data"]}
 
 
 def save_settings(settings: Dict[str, Any]) -> None:
+    # 先寫入暫存檔再替換，寫到一半中斷也不會留下損壞的設定檔
+    tmp = SETTINGS_FILE.with_suffix(".json.tmp")
+    with _SETTINGS_LOCK:
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(json_dumps(settings))
+            os.replace(tmp, SETTINGS_FILE)
+            _SETTINGS_CACHE.update(mtime=SETTINGS_FILE.stat().st_mtime_ns,
+                                   data=dict(settings))
+        except Exception:
+            pass
+
+
+_BASE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Accept": "*/*",
+}
+_CANON_HEADERS = ("User-Agent", "Referer", "Origin", "Cookie", "Authorization")
+_CANON_PAIRS = tuple((k, k.lower()) for k in _CANON_HEADERS)
+
+
+@functools.lru_cache(maxsize=256)
+def _origin_of(url: str) -> Optional[str]:
+    # 同一批項目多半共用少數幾個來源頁面，解析結果可重複使用
     try:
-        with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, indent=4)
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
     except Exception:
-        pass
+        return None
 
 
 def get_headers(item_headers: Optional[Dict] = None, referer_url: Optional[str] = None) -> Dict[str, str]:
-    h = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-        "Accept": "*/*",
-    }
+    h = _BASE_HEADERS.copy()
     if item_headers:
-        for key in ["User-Agent", "Referer", "Origin", "Cookie", "Authorization"]:
-            for k, v in item_headers.items():
-                if k.lower() == key.lower():
-                    h[key] = v
+        lower_map = {k.lower(): v for k, v in item_headers.items()}
+        for canon, low in _CANON_PAIRS:
+            v = lower_map.get(low)
+            if v is not None:
+                h[canon] = v
         return h
     if referer_url:
         h["Referer"] = referer_url
-        try:
-            parsed = urlparse(referer_url)
-            h["Origin"] = f"{parsed.scheme}://{parsed.netloc}"
-        except Exception:
-            pass
+        origin = _origin_of(referer_url)
+        if origin is not None:
+            h["Origin"] = origin
     return h
 
 
+@functools.lru_cache(maxsize=1)
 def get_chrome_main_version():
-    try:
-        # Windows
-        output = subprocess.check_output(
-            r'reg query "HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon" /v version',
-            shell=True, stderr=subprocess.DEVNULL
-        ).decode('utf-8', errors='ignore')
-        match = re.search(r'version\s+REG_SZ\s+(\d+)', output)
-        if match:
-            return int(match.group(1))
-    except:
-        pass
+    if winreg is not None:
+        try:
+            # Windows：直接讀登錄檔，不必啟動 reg.exe / cmd.exe
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon") as key:
+                version, _ = winreg.QueryValueEx(key, "version")
+            return int(str(version).split(".")[0])
+        except (OSError, ValueError):
+            pass
 
     try:
         # macOS / Linux 常見路徑
         output = subprocess.check_output(
             ["google-chrome", "--version"]).decode()
-        match = re.search(r'Chrome\s+(\d+)', output)
+        match = _CHROME_UNIX_RE.search(output)
         if match:
             return int(match.group(1))
     except:
         pass
     return None
 
+
+# lru_cache 不會合併同時發生的未命中；多個執行緒同時建立瀏覽器時只偵測一次
+_CHROME_VER_LOCK = threading.Lock()
+
+
+def cached_chrome_main_version(settings, refresh=False):
+    # 優先使用 settings 中未過期的紀錄，連本次執行的第一次偵測都省下
+    with _CHROME_VER_LOCK:
+        entry = settings.get("chrome_main_ver")
+        if not refresh and isinstance(entry, dict) and entry.get("value") \
+                and time.time() - entry.get("ts", 0) < CHROME_VER_TTL:
+            return entry["value"]
+        if refresh:
+            get_chrome_main_version.cache_clear()
+        ver = get_chrome_main_version()
+        if ver:
+            settings["chrome_main_ver"] = {"value": ver, "ts": time.time()}
+            save_settings(settings)
+        return ver
+
 # --- 自定義 Logger (用於攔截 yt-dlp 訊息) ---
 
 
@@ -209,16 +409,16 @@ class MyLogger:
     def __init__(self, log_callback, debug_mode=False):
         self.log_callback = log_callback
         self.debug_mode = debug_mode
+        if not debug_mode:
+            # 非除錯模式下警告直接丟棄，免去每次呼叫時的判斷
+            self.warning = self.debug
 
     def debug(self, msg):
-        # 只有在非常詳細的除錯需求時才打開 debug 訊息，否則訊息量會太大
-        if self.debug_mode and ("[debug]" in msg or "HLS" in msg):
-            pass  # 暫時忽略詳細 debug，避免洗版，需要可打開
+        # yt-dlp 每個分片都會呼叫；詳細 debug 訊息量太大，會洗版，一律忽略
         pass
 
     def warning(self, msg):
-        if self.debug_mode:
-            self.log_callback(f"⚠️ [下載警告] {msg}")
+        self.log_callback(f"⚠️ [下載警告] {msg}")
 
     def error(self, msg):
         # 攔截重要錯誤並顯示在 GUI
@@ -227,29 +427,114 @@ class MyLogger:
 # --- 核心邏輯 ---
 
 
-def check_is_main_video(url: str, headers: Dict[str, str]) -> Tuple[bool, str]:
-    try:
-        response = requests.get(url, headers=headers, timeout=5, verify=False)
-        if response.status_code != 200:
-            return False, f"HTTP {response.status_code}"
+def _playlist_chunks(response):
+    # 回傳內容區塊迭代器；開頭 (略過 BOM 與空白) 不是 '#' 時代表 HTML 頁面或二進位檔，回傳 None
+    chunks = response.iter_content(chunk_size=8192)
+    first = next(chunks, b"")
+    if first.lstrip(b"\xef\xbb\xbf \t\r\n")[:1] != b"#":
+        return None
+    return itertools.chain((first,), chunks)
+
+
+def _scan_playlist(chunks, total_duration: float = 0.0, tail: bytes = b"",
+                   final: bool = True) -> Tuple[bool, float, bytes]:
+    # 回傳 (是否為主清單, 已累計長度, 尚未完結的最後一行)；結果一確定就停止讀取
+    # 直接比對 bytes，省去逐行解碼與重複 split；tail 讓續傳的 Range 從斷行處接上
+    if final:
+        chunks = itertools.chain(chunks, (b"\n",))  # 讓最後一行 (可能無換行) 也被處理
+    for chunk in chunks:
+        buf = tail + chunk
+        cut = buf.rfind(b"\n") + 1
+        if not cut:
+            tail = buf
+            continue
+        block, tail = buf[:cut], buf[cut:]
+        # 每個區塊以正規表示式掃描一次，不再逐行切割比對
+        if _M3U_MASTER_RE.search(block):
+            return True, total_duration, b""
+        for m in _M3U_EXTINF_RE.finditer(block):
+            try:
+                total_duration += float(m.group(1))
+            except ValueError:
+                continue
+            if total_duration > 300:
+                return False, total_duration, b""
+    return False, total_duration, tail
 
-        content = response.text
-        if "#EXT-X-STREAM-INF" in content:
-            return True, "Master Playlist"
 
-        total_duration = 0.0
-        for line in content.split('\n'):
-            if line.startswith("#EXTINF:"):
-                try:
-                    duration_part = line.split(':')[1].split(',')[0]
-                    total_duration += float(duration_part)
-                except:
-                    pass
+def _probe_result(is_master: bool, total_duration: float) -> Tuple[bool, str]:
+    if is_master:
+        return True, "Master Playlist"
+    if total_duration > 300:
+        return True, f"長度 {int(total_duration)}s"
+    return False, f"過短 ({int(total_duration)}s)"
+
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+def _range_span(response) -> Tuple[Optional[int], Optional[int]]:
+    # Content-Range: bytes 0-1234/5678 → (1235, 5678)；無法解析時為 (None, None)
+    m = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+    if not m:
+        return None, None
+    total = m.group(3)
+    return int(m.group(2)) + 1, int(total) if total.isdigit() else None
+
+
+def _counted(chunks, received: List[int]):
+    # 邊讀邊累計實際收到的位元組數
+    for chunk in chunks:
+        received[0] += len(chunk)
+        yield chunk
 
-        if total_duration > 300:
-            return True, f"長度 {int(total_duration)}s"
-        else:
-            return False, f"過短 ({int(total_duration)}s)"
+
+def check_is_main_video(url: str, headers: Dict[str, str], session: Optional[requests.Session] = None) -> Tuple[bool, str]:
+    session = session or SESSION
+    # Range 的位移以原始位元組計算，必須要求不壓縮，否則續傳會落在 gzip 串流中間
+    headers = {**headers, "Accept-Encoding": "identity"}
+    try:
+        # 先只要求前段內容：主清單標籤與足夠的分片長度通常都在開頭；
+        # 無法判定時從實際收到的結尾續傳，直到有結果或讀完整份
+        total_duration, tail, offset = 0.0, b"", 0
+        rng: Optional[str] = f"bytes=0-{PROBE_PREFIX_BYTES - 1}"
+        while True:
+            req_headers = {**headers, "Range": rng} if rng else headers
+            with session.get(url, headers=req_headers, timeout=5, verify=False, stream=True) as response:
+                status = response.status_code
+                if status == 416 and rng:
+                    if offset:
+                        # 續傳位置已在檔尾：先前讀到的就是整份內容
+                        return _probe_result(*_scan_playlist((), total_duration, tail)[:2])
+                    rng = None  # 伺服器拒絕前段範圍 (例如空檔)，改為完整讀取
+                    continue
+                if status == 200 or (status == 206 and not offset):
+                    # 從檔頭開始的內容：先確認是播放清單 (200 代表伺服器忽略 Range，從頭累計)
+                    chunks = _playlist_chunks(response)
+                    if chunks is None:
+                        return False, NOT_PLAYLIST_REASON  # 不再為非播放清單續傳整個檔案
+                    total_duration, tail, offset = 0.0, b"", 0
+                elif status == 206:
+                    chunks = response.iter_content(chunk_size=8192)
+                else:
+                    return False, f"HTTP {status}"
+
+                end, total = _range_span(response) if status == 206 else (None, None)
+                complete = status == 200 or (end is not None and total is not None and end >= total)
+                received = [0]
+                is_master, total_duration, tail = _scan_playlist(
+                    _counted(chunks, received), total_duration, tail, final=complete)
+                if is_master or total_duration > 300 or complete:
+                    return _probe_result(is_master, total_duration)
+                if response.headers.get("Content-Encoding", "identity") != "identity":
+                    # 伺服器仍回傳壓縮內容，位移不可靠：改為完整讀取
+                    total_duration, tail, offset, rng = 0.0, b"", 0, None
+                    continue
+                if not received[0]:
+                    return _probe_result(*_scan_playlist((), total_duration, tail)[:2])
+                # 伺服器可能回傳比要求更短的範圍，以實際結尾為續傳起點
+                offset = end if end is not None else offset + received[0]
+                rng = f"bytes={offset}-"
 
     except Exception as e:
         return False, str(e)
@@ -271,61 +556,214 @@ class SafeChrome(uc.Chrome):
             pass
 
 
-def create_driver(settings):
+def build_chrome_options(settings):
     options = uc.ChromeOptions()
     options.add_argument("--disable-gpu")
     options.add_argument("--mute-audio")
     options.add_argument("--no-first-run")
-    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
-
-    chrome_main_ver = get_chrome_main_version()
-    driver = SafeChrome(options=options, use_subprocess=True,
-                        headless=False, version_main=chrome_main_ver)
+    # 視窗大小與位置在啟動時就決定，省去啟動後的額外往返與重新排版
     try:
         w = int(settings.get("browser_width", 1280))
         h = int(settings.get("browser_height", 720))
-        driver.set_window_rect(50, 50, w, h)
-    except:
+        options.add_argument(f"--window-size={w},{h}")
+        options.add_argument("--window-position=50,50")
+    except (TypeError, ValueError):
         pass
+    # 略過與嗅探無關的啟動工作
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-sync")
+    options.add_argument("--no-default-browser-check")
+    options.add_argument("--disable-features=Translate,MediaRouter")
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    # 效能日誌自行啟用 Network 網域，事件從瀏覽器啟動就開始記錄；
+    # 嗅探只看 Network.requestWillBeSent，關閉 Page 網域減少日誌量
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True,
+                                                         "enablePage": False})
+    return options
+
+
+# uc 啟動時會下載並修補共用的 chromedriver 執行檔，同時啟動多個會互相衝突；
+# 只序列化啟動過程，啟動後的瀏覽器仍可並行使用
+_UC_LAUNCH_LOCK = threading.Lock()
+_DRIVER_COPY_PREFIX = "undetected_chromedriver_t"
+
+
+def _thread_driver_path(version_main) -> str:
+    # 每個執行緒使用自己的 chromedriver 複本：驅動程式池與批次修復會同時保留多個瀏覽器，
+    # Windows 上執行中的 exe 無法被覆寫或刪除，共用同一個檔案時下一次修補會失敗。
+    # 檔名含版本，Chrome 更新後自動改用新複本；已存在的複本直接沿用，不必每次重新下載。
+    # 需在 _UC_LAUNCH_LOCK 內呼叫
+    ext = ".exe" if os.name == "nt" else ""
+    path = os.path.join(uc.Patcher.data_path,
+                        f"{_DRIVER_COPY_PREFIX}{threading.get_ident()}_v{version_main or 0}{ext}")
+    if not os.path.exists(path):
+        patcher = uc.Patcher(version_main=version_main or 0)
+        patcher.auto()
+        shutil.copy2(patcher.executable_path, path)
+    return path
+
+
+def _remove_driver_copies():
+    # 結束時清理各執行緒的複本；仍被使用中的檔案略過
+    for p in Path(uc.Patcher.data_path).glob(f"{_DRIVER_COPY_PREFIX}*"):
+        try:
+            p.unlink()
+        except OSError:
+            pass
+
+
+def _launch_chrome(settings, version_main):
+    # uc 不允許重用同一個 ChromeOptions 物件，每次都重新建立
+    # port 維持預設 0，由 uc/selenium 自行挑選空閒埠
+    with _UC_LAUNCH_LOCK:
+        return SafeChrome(options=build_chrome_options(settings), use_subprocess=True,
+                          headless=False, version_main=version_main,
+                          driver_executable_path=_thread_driver_path(version_main))
+
+
+def create_driver(settings):
+    chrome_main_ver = cached_chrome_main_version(settings)
     try:
-        driver.execute_cdp_cmd('Network.enable', {})
-    except:
-        pass
+        driver = _launch_chrome(settings, chrome_main_ver)
+    except Exception:
+        # Chrome 可能已更新，記錄的版本過期，重新偵測後再試一次
+        fresh_ver = cached_chrome_main_version(settings, refresh=True)
+        if fresh_ver == chrome_main_ver:
+            raise
+        driver = _launch_chrome(settings, fresh_ver)
     return driver
 
 
+class DriverPool:
+    """保留少量已啟動的瀏覽器，連續嗅探時跳過 Chrome 冷啟動。"""
+
+    def __init__(self, max_idle=DRIVER_POOL_SIZE, idle_timeout=DRIVER_IDLE_TIMEOUT):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._free: List[Tuple[Any, Tuple[int, int], float]] = []
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _signature(settings) -> Tuple[int, int]:
+        return (int(settings.get("browser_width", 1280)),
+                int(settings.get("browser_height", 720)))
+
+    def acquire(self, settings):
+        sig = self._signature(settings)
+        while True:
+            with self._lock:
+                if not self._free:
+                    break
+                driver, driver_sig, _ = self._free.pop()
+            if driver_sig != sig:
+                driver.quit()
+                continue
+            try:
+                # 還原先前被最小化的視窗，同時確認瀏覽器仍存活
+                driver.set_window_rect(50, 50, *sig)
+                return driver
+            except Exception:
+                driver.quit()
+        return create_driver(settings)
+
+    def release(self, driver, settings):
+        if self._closed.is_set():
+            driver.quit()
+            return
+        try:
+            driver.get("about:blank")
+            driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            # 清空殘留的效能日誌，避免污染下一次嗅探
+            driver.get_log("performance")
+        except Exception:
+            driver.quit()
+            return
+
+        evicted = []
+        with self._lock:
+            self._free.append((driver, self._signature(settings), time.monotonic()))
+            while len(self._free) > self.max_idle:
+                evicted.append(self._free.pop(0)[0])
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap_idle, daemon=True)
+                self._reaper.start()
+        for d in evicted:
+            d.quit()
+
+    def _reap_idle(self):
+        while not self._closed.wait(30):
+            now = time.monotonic()
+            with self._lock:
+                expired = [d for d, _, ts in self._free if now - ts > self.idle_timeout]
+                self._free = [e for e in self._free if now - e[2] <= self.idle_timeout]
+            for d in expired:
+                d.quit()
+
+    def shutdown(self):
+        self._closed.set()
+        with self._lock:
+            drivers = [d for d, _, _ in self._free]
+            self._free = []
+        for d in drivers:
+            d.quit()
+
+
+DRIVER_POOL = DriverPool()
+
+
 def core_sniff_logic(driver, stop_event, log_callback, max_wait=60) -> Tuple[Optional[str], Optional[Dict], str]:
     found_m3u8 = None
     captured_headers = {}
     valid_reason = ""
+    # 同一個網址常被重複請求；命中即結束，故出現過的網址必定已判定為無效
+    seen_urls = set()
+    started = time.monotonic()
+    next_report = 5
+    poll_interval = SNIFF_POLL_INTERVAL_BUSY
 
-    for i in range(max_wait):
+    while True:
         if stop_event.is_set():
             return None, None, "Stop"
 
-        if i > 0 and i % 5 == 0:
-            log_callback(f"⚡ 深度掃描中... ({i}/{max_wait}s)")
+        elapsed = time.monotonic() - started
+        if elapsed >= max_wait:
+            break
+        if elapsed >= next_report:
+            log_callback(f"⚡ 深度掃描中... ({next_report}/{max_wait}s)")
+            next_report += 5
 
         logs = driver.get_log("performance")
         for entry in logs:
+            # 先用字串比對過濾，只有可能命中的事件才做 JSON 解析
+            raw = entry.get("message")
+            if not raw or _CDP_URL_MARK not in raw or _CDP_METHOD_MARK not in raw:
+                continue
             try:
-                msg = json.loads(entry["message"])["message"]
+                msg = json_loads(raw)["message"]
                 if msg["method"] == "Network.requestWillBeSent":
                     params = msg["params"]
                     request = params["request"]
                     u = request["url"]
 
+                    if u in seen_urls:
+                        continue
+                    seen_urls.add(u)
+
                     if ".m3u8" in u:
-                        if any(x in u for x in ["doubleclick", "adsr", "litix", "segment", "favicon"]):
+                        if _BLOCK_RE.search(u):
                             continue
 
-                        tmp_headers = request.get("headers", {})
-                        if "Referer" not in tmp_headers and "referer" not in tmp_headers:
-                            tmp_headers["Referer"] = params.get(
-                                "documentURL", "")
+                        tmp_headers = request.get("headers") or {}
+                        if not any(k.lower() == "referer" for k in tmp_headers):
+                            tmp_headers = {**tmp_headers,
+                                           "Referer": params.get("documentURL", "")}
 
                         check_h = get_headers(tmp_headers, u)
-                        is_main, reason = check_is_main_video(u, check_h)
+                        is_main, reason = check_is_main_video(u, check_h, SESSION)
 
                         if is_main:
                             found_m3u8 = u
@@ -337,7 +775,13 @@ def core_sniff_logic(driver, stop_event, log_callback, max_wait=60) -> Tuple[Opt
 
         if found_m3u8:
             return found_m3u8, captured_headers, valid_reason
-        time.sleep(1)
+        # 頁面仍有網路活動時緊密輪詢以便更快發現目標，安靜下來後逐步放寬間隔
+        if logs:
+            poll_interval = SNIFF_POLL_INTERVAL_BUSY
+        else:
+            poll_interval = min(poll_interval * 2, SNIFF_POLL_INTERVAL)
+        if stop_event.wait(poll_interval):
+            return None, None, "Stop"
 
     return None, None, "Timeout"
 
@@ -351,7 +795,7 @@ def single_sniff_thread(target_url, stop_event, update_callback, log_callback, s
     log_callback(f"🚀 啟動隱形瀏覽器...")
     driver = None
     try:
-        driver = create_driver(settings)
+        driver = DRIVER_POOL.acquire(settings)
         log_callback(f"🌍 載入: {target_url[:40]}...")
         driver.get(target_url)
 
@@ -363,10 +807,8 @@ def single_sniff_thread(target_url, stop_event, update_callback, log_callback, s
 
         if not debug:
             log_callback(f"⏳ 等待 {hide_delay} 秒...")
-            for _ in range(hide_delay):
-                if stop_event.is_set():
-                    return
-                time.sleep(1)
+            if stop_event.wait(hide_delay):
+                return
             try:
                 driver.minimize_window()
             except:
@@ -402,34 +844,37 @@ def single_sniff_thread(target_url, stop_event, update_callback, log_callback, s
         update_callback(None, str(e))
     finally:
         if driver:
-            driver.quit()
+            DRIVER_POOL.release(driver, settings)
 
 
 def check_validity_thread(items_to_check, update_row_callback, log_callback, stop_event):
     log_callback(f"🔍 開始檢查 {len(items_to_check)} 個連結...")
-    with requests.Session() as s:
-        for idx, item in items_to_check:
-            if stop_event.is_set():
-                break
-            url = item.get("m3u8", "")
-            stored_headers = item.get("headers", {})
-            original_url = item.get("original_url")
-            if not url:
-                continue
 
-            update_row_callback(idx, "檢查中...", None)
-            req_headers = get_headers(stored_headers, original_url)
-
-            try:
-                is_valid_video, reason = check_is_main_video(url, req_headers)
-                status_text = f"✅ 有效 ({reason})" if is_valid_video else f"❌ 失效 ({reason})"
-                tag = "completed" if is_valid_video else "invalid"
-            except Exception:
-                status_text = f"❌ 連線失敗"
-                tag = "invalid"
-
-            update_row_callback(idx, status_text, tag)
-            time.sleep(0.1)
+    def probe(row_id, item):
+        if stop_event.is_set():
+            return
+        update_row_callback(row_id, "檢查中...", "")
+        req_headers = get_headers(item.get("headers", {}), item.get("original_url"))
+        try:
+            is_valid_video, reason = check_is_main_video(
+                item["m3u8"], req_headers, SESSION)
+            status_text = f"✅ 有效 ({reason})" if is_valid_video else f"❌ 失效 ({reason})"
+            tag = "completed" if is_valid_video else "invalid"
+        except Exception:
+            status_text = "❌ 連線失敗"
+            tag = "invalid"
+        update_row_callback(row_id, status_text, tag)
+
+    targets = [(row_id, item) for row_id, item in items_to_check if item.get("m3u8")]
+    if targets:
+        # 探測屬於網路等待，以執行緒池並行，上限由 worker 數控制
+        with ThreadPoolExecutor(max_workers=min(VALIDITY_MAX_WORKERS, len(targets))) as pool:
+            futures = [pool.submit(probe, row_id, item) for row_id, item in targets]
+            for _ in as_completed(futures):
+                if stop_event.is_set():
+                    # 一次取消所有尚未開始的探測，不逐一走訪 future
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    break
     log_callback("🏁 檢查完成")
 
 
@@ -437,25 +882,23 @@ def batch_repair_thread(items_to_repair, update_row_callback, log_callback, stop
     hide_delay = int(settings.get("hide_delay", 5))
     driver = None
     try:
-        driver = create_driver(settings)
-        for i, (idx, item) in enumerate(items_to_repair):
+        driver = DRIVER_POOL.acquire(settings)
+        for i, (row_id, item) in enumerate(items_to_repair):
             if stop_event.is_set():
                 break
             original_url = item.get("original_url")
-            update_row_callback(idx, "正在修復...", "downloading")
+            update_row_callback(row_id, "正在修復...", "downloading")
 
             if not original_url:
-                update_row_callback(idx, "無原始連結", "error")
-                log_callback(f"⚠️ 無法修復 Index {idx}: 缺少原始網址")
+                update_row_callback(row_id, "無原始連結", "error")
+                log_callback(f"⚠️ 無法修復 {item.get('title', 'Unknown')}: 缺少原始網址")
                 continue
 
             try:
                 log_callback(f"🔧 修復中: {item.get('title', 'Unknown')}")
                 driver.get(original_url)
-                for _ in range(hide_delay):
-                    if stop_event.is_set():
-                        raise Exception("Stop")
-                    time.sleep(1)
+                if stop_event.wait(hide_delay):
+                    raise Exception("Stop")
                 try:
                     driver.minimize_window()
                 except:
@@ -465,20 +908,69 @@ def batch_repair_thread(items_to_repair, update_row_callback, log_callback, stop
                     driver, stop_event, log_callback, max_wait=45)
 
                 if new_m3u8:
-                    log_callback(f"✅ 修復成功 (Index {idx})")
+                    log_callback(f"✅ 修復成功: {item.get('title', 'Unknown')}")
                     update_row_callback(
-                        idx, "✅ 已修復", "repaired", new_url=new_m3u8, new_headers=new_headers)
+                        row_id, "✅ 已修復", "repaired", new_url=new_m3u8, new_headers=new_headers)
                 else:
-                    update_row_callback(idx, "❌ 失敗", "error")
+                    update_row_callback(row_id, "❌ 失敗", "error")
             except Exception as e:
-                update_row_callback(idx, "錯誤", "error")
+                update_row_callback(row_id, "錯誤", "error")
                 log_callback(f"❌ 修復錯誤: {e}")
     finally:
         if driver:
-            driver.quit()
+            DRIVER_POOL.release(driver, settings)
         log_callback("🏁 修復任務結束")
 
 
+class YdlPool:
+    """依 headers/除錯模式快取閒置的 YoutubeDL，連續下載時省去重新建構。"""
+
+    def __init__(self, max_idle=YDL_POOL_SIZE):
+        self.max_idle = max_idle
+        self._free: List[Tuple[Any, Any, Dict[str, Any]]] = []
+        self._lock = threading.Lock()
+
+    def acquire(self, key, ydl_opts):
+        with self._lock:
+            for i, (k, _, _) in enumerate(self._free):
+                if k == key:
+                    _, ydl, slot = self._free.pop(i)
+                    break
+            else:
+                ydl = None
+        if ydl is None:
+            # progress hook 只能在建構時註冊，透過 slot 轉發給當前任務
+            slot: Dict[str, Any] = {}
+            opts = dict(ydl_opts, progress_hooks=[
+                        lambda d: slot['hook'](d)])
+            ydl = yt_dlp.YoutubeDL(opts)  # type: ignore
+        # outtmpl 與 logger 每次使用時才從 params 讀取，可直接替換
+        ydl.params['outtmpl']['default'] = ydl_opts['outtmpl']
+        ydl.params['logger'] = ydl_opts['logger']
+        slot['hook'] = ydl_opts['progress_hooks'][0]
+        return ydl, slot
+
+    def release(self, key, ydl, slot):
+        slot['hook'] = lambda d: None
+        evicted = []
+        with self._lock:
+            self._free.append((key, ydl, slot))
+            while len(self._free) > self.max_idle:
+                evicted.append(self._free.pop(0)[1])
+        for y in evicted:
+            y.close()
+
+    def shutdown(self):
+        with self._lock:
+            idle = [y for _, y, _ in self._free]
+            self._free = []
+        for y in idle:
+            y.close()
+
+
+YDL_POOL = YdlPool()
+
+
 def download_task(url, title, save_path, progress_callback, log_callback, stop_event, item_data, settings):
     """
     更新後的下載任務：
@@ -487,23 +979,35 @@ def download_task(url, title, save_path, progress_callback, log_callback, stop_e
     3. 優化參數：多線程、重試機制
     """
     log_callback(f"⬇️ 開始下載: {title}")
-    safe_title = re.sub(r'[\\/*?:"<>|]', "", title)
+    safe_title = _UNSAFE_FN_RE.sub("", title)
     output_template = os.path.join(save_path, f'{safe_title}.%(ext)s')
 
     # 判斷是否為除錯模式
     debug_mode = settings.get("debug_mode", False)
 
+    # 進度節流：整數百分比沒變且間隔不足時不回報，避免塞爆 Tk 事件佇列
+    progress_state = {'last_pct': -1, 'last_ts': 0.0}
+
     def hook(d):
         if stop_event.is_set():
             raise Exception("Download Cancelled")
-        if d['status'] == 'downloading':
-            p_str = d.get('_percent_str', '0%').replace('%', '')
-            p_str = re.sub(r'\x1b\[[0-9;]*m', '', p_str).strip()
+        status = d['status']
+        if status == 'downloading':
+            p_str = d.get('_percent_str', '0%')
+            if '\x1b' in p_str:  # 只有帶顏色碼時才需要正規表示式清除
+                p_str = _ANSI_RE.sub('', p_str)
             try:
-                progress_callback(title, float(p_str))
+                p = float(_PCT_RE.sub('', p_str))
             except:
-                pass
-        elif d['status'] == 'finished':
+                return
+            now = time.monotonic()
+            ip = int(p)
+            if ip == progress_state['last_pct'] and now - progress_state['last_ts'] < PROGRESS_MIN_INTERVAL:
+                return
+            progress_state['last_pct'] = ip
+            progress_state['last_ts'] = now
+            progress_callback(title, p)
+        elif status == 'finished':
             progress_callback(title, 100)
             log_callback(f"✅ 下載完成: {safe_title}")
 
@@ -537,17 +1041,33 @@ def download_task(url, title, save_path, progress_callback, log_callback, stop_e
         'ignoreerrors': True,                # 遇到錯誤不直接崩潰 (適合播放清單)
     }
 
+    ydl_key = (tuple(sorted(req_headers.items())), debug_mode)
+    ydl, slot = None, None
+    retcode, error = 1, None
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:  # type: ignore
-            ydl.download([url])
+        ydl, slot = YDL_POOL.acquire(ydl_key, ydl_opts)
+        # ignoreerrors 下錯誤與取消 (hook 拋出的例外) 都不會往外拋，只反映在回傳碼
+        retcode = ydl.download([url])
     except Exception as e:
-        if "Download Cancelled" in str(e):
-            log_callback(f"🛑 已停止下載: {title}")
-            progress_callback(title, -1)
+        error = e
+    cancelled = stop_event.is_set() or "Download Cancelled" in str(error or "")
+    if ydl is not None:
+        if retcode or error or cancelled:
+            # 失敗或中斷後的實例狀態不可靠 (錯誤碼也不會重設)，不放回快取
+            ydl.close()
         else:
-            # 這裡只抓最外層的錯誤，詳細錯誤會由 MyLogger 抓取
-            log_callback(f"❌ 下載流程中斷: {str(e)[:50]}...")
-            progress_callback(title, -2)
+            YDL_POOL.release(ydl_key, ydl, slot)
+
+    if cancelled:
+        log_callback(f"🛑 已停止下載: {title}")
+        progress_callback(title, -1)
+    elif error is not None:
+        # 這裡只抓最外層的錯誤，詳細錯誤會由 MyLogger 抓取
+        log_callback(f"❌ 下載流程中斷: {str(error)[:50]}...")
+        progress_callback(title, -2)
+    elif retcode:
+        log_callback(f"❌ 下載失敗: {title}")
+        progress_callback(title, -2)
 
 # --- 智慧標題編輯器 ---
 
@@ -577,30 +1097,13 @@ class TitleEditorWindow:
         btn_frame = ttk.Frame(frame)
         btn_frame.pack(fill="x", pady=5)
 
-        brackets_pattern = r'[《【\[(「"“（](.*?)[》】\])」"”）]'
-        matches = re.findall(brackets_pattern, old_title)
-
-        splits = re.split(r'[|\-｜_：\[\]【】()（）《》\s]+', old_title)
-
-        parts = []
-        seen = set()
-
-        for m in matches:
-            clean_m = m.strip()
-            if clean_m and clean_m not in seen:
-                parts.append(clean_m)
-                seen.add(clean_m)
-
-        for s in splits:
-            clean_s = s.strip()
-            if clean_s and clean_s not in seen:
-                parts.append(clean_s)
-                seen.add(clean_s)
+        # 括號內容優先，其次是分隔後的片段；dict.fromkeys 保留順序並去除重複
+        candidates = itertools.chain(_BRACKETS_RE.findall(old_title),
+                                     _SPLIT_RE.split(old_title))
+        parts = dict.fromkeys(filter(None, map(str.strip, candidates)))
 
         row, col = 0, 0
         for part in parts:
-            if len(part) < 1:
-                continue
             btn = ttk.Button(btn_frame, text=part, bootstyle="info-outline",
                              command=lambda t=part: self.set_text(t))
             btn.grid(row=row, column=col, padx=4, pady=4, sticky="ew")
@@ -739,16 +1242,50 @@ class App:
         self.settings = load_settings()
         current_theme = self.settings.get("theme", "cosmo")
         self.style = ttk.Style(current_theme)
+        _theme = self.style.theme_use()
+        theme_name = str(_theme) if _theme is not None else ""
+        # 主題於啟動時固定，判斷一次後沿用
+        self._is_light = theme_name in LIGHT_THEMES or "light" in theme_name
+        self._log_bg, self._log_fg = LOG_COLORS[self._is_light]
 
         self.data_list = []
+        # 每列最後寫入 Treeview 的 (values, tags)，用來比對出需要更新的列
+        self._row_cache: List[Tuple[tuple, tuple]] = []
+        # Treeview iid 與列位置脫鉤：每列有固定的 iid，刪除時不必重新編號整張表
+        self._row_iids: List[str] = []
+        self._iid_to_idx: Dict[str, int] = {}
+        self._row_tag: Dict[str, str] = {}  # iid → 最後一次狀態更新的標籤
+        self._iid_counter = itertools.count()
+        self._checked_indices: Set[int] = set()
+        # 列標籤於第一次使用時才 tag_configure (見 _row_tags)
+        self._configured_tags: Set[str] = set()
+        # 捲動期間延後的狀態更新：iid → 標籤
+        self._scroll_until = 0.0
+        self._scroll_top: Optional[int] = None  # 可視範圍頂端的列索引
+        self._dirty_rows: Dict[str, Optional[str]] = {}
+        self._more_rows_scheduled = False
+        # 背景執行緒的介面更新先排入佇列，由主執行緒定時批次套用
+        self._ui_updates: collections.deque = collections.deque()
+        # 下載進度只保留每列 (iid) 的最新值，由 _progress_pump 定時一次套用
+        self._pending_progress: Dict[str, float] = {}
+        self._progress_lock = threading.Lock()
+        self._log_buffer: collections.deque = collections.deque()
+        self._log_lines = 0  # log_text 目前的行數，免去向 Tcl 查詢
+        self._log_flush_scheduled = False
+        self._log_ts: Tuple[int, str] = (-1, "")
         self.stop_event = threading.Event()
         self.active_downloads: Dict[str, threading.Event] = {}
+        self._download_dir: Optional[str] = None  # 已確認存在的下載資料夾
+        self._entry_menu: Optional[tk.Menu] = None
+        self._entry_menu_target = None
         self.url_var = tk.StringVar()
         self.debug_mode = tk.BooleanVar(
             value=self.settings.get("debug_mode", False))
 
         self._init_ui()
         self._apply_custom_styles()
+        self.root.after(UI_DRAIN_INTERVAL_MS, self._drain_ui_updates)
+        self.root.after(PROGRESS_PUMP_INTERVAL_MS, self._progress_pump)
 
     def _init_ui(self):
         toolbar = ttk.Frame(self.root, padding=(10, 5))
@@ -821,10 +1358,10 @@ class App:
         sb_y = ttk.Scrollbar(tree_frame, orient="vertical")
         sb_x = ttk.Scrollbar(tree_frame, orient="horizontal")
 
-        cols = ("check", "title", "status", "m3u8")
-        self.tree = ttk.Treeview(tree_frame, columns=cols, show="headings",
+        self.tree = ttk.Treeview(tree_frame, columns=TREE_COLUMNS, show="headings",
                                  selectmode="extended", style="Custom.Treeview",
-                                 yscrollcommand=sb_y.set, xscrollcommand=sb_x.set)
+                                 yscrollcommand=self._tree_yscroll_proxy(sb_y),
+                                 xscrollcommand=sb_x.set)
 
         sb_y.config(command=self.tree.yview)
         sb_x.config(command=self.tree.xview)
@@ -858,46 +1395,50 @@ class App:
                                 font=("Consolas", 9), relief="flat", padx=5, pady=5,
                                 yscrollcommand=log_sb.set)
         log_sb.config(command=self.log_text.yview)
-        _theme = self.style.theme_use()
-        theme_name = str(_theme) if _theme is not None else ""
-        is_light = theme_name in ["cosmo", "flatly", "journal",
-                                  "litera", "minty", "lumen"] or "light" in theme_name
-        self.log_text.config(bg="#f8f9fa" if is_light else "#2b2b2b",
-                             fg="#333333" if is_light else "#dddddd")
+        self.log_text.config(bg=self._log_bg, fg=self._log_fg)
         self.log_text.pack(side="left", fill="x", expand=True)
         self.create_context_menu(None, is_entry=False)
 
-    def _apply_custom_styles(self):
-        self.style.configure("Custom.Treeview", rowheight=30,
-                             font=("Microsoft JhengHei UI", 10))
-        self.style.configure("Custom.Treeview.Heading",
-                             font=("Microsoft JhengHei UI", 10, "bold"),
-                             borderwidth=3,
-                             relief="raised")
+    def _tree_yscroll_proxy(self, scrollbar):
+        # 滾輪、拖曳捲軸與鍵盤捲動最後都會經過 yscrollcommand；
+        # first 是「頂端列索引 / 總列數」，插入或刪除列也會改變它，
+        # 因此換算回頂端列索引，只有頂端那一列真的移動才算捲動
+        def _set(first, last):
+            top = round(float(first) * len(self._row_cache))
+            if top != self._scroll_top:
+                self._scroll_top = top
+                self._scroll_until = time.monotonic() + SCROLL_SETTLE_SEC
+            scrollbar.set(first, last)
+            # 接近底部 (或列數還填不滿畫面) 時才插入下一批
+            if (float(last) >= ROW_LOAD_AHEAD and not self._more_rows_scheduled
+                    and len(self._row_cache) < len(self.data_list)):
+                self._more_rows_scheduled = True
+                self.root.after_idle(self._insert_rows)
+        return _set
 
-        _theme = self.style.theme_use()
-        theme_name = str(_theme) if _theme is not None else ""
-        is_light = theme_name in ["cosmo", "flatly", "journal",
-                                  "litera", "minty", "lumen"] or "light" in theme_name
-
-        self.tree.tag_configure("downloading", foreground="#28a745")
-        self.tree.tag_configure("error", foreground="#dc3545")
-        self.tree.tag_configure("stopped", foreground="#fd7e14")
-        self.tree.tag_configure("completed", foreground="#007bff")
-        self.tree.tag_configure(
-            "invalid", foreground="#dc3545", background="#ffe6e6" if is_light else "#4a1b1b")
-        self.tree.tag_configure("repaired", foreground="#00bc8c")
-        self.tree.tag_configure(
-            "checked", background="#e9ecef" if is_light else "#444")
+    def _apply_custom_styles(self):
+        style = self.style
+        style.configure("Custom.Treeview", **TREE_STYLE)
+        style.configure("Custom.Treeview.Heading", **TREE_HEADING_STYLE)
+
+    def _row_tags(self, tag):
+        if not tag:
+            return ()
+        if tag not in self._configured_tags:
+            fg, light_bg, dark_bg = TAG_COLORS[tag]
+            opts = {}
+            if fg:
+                opts["foreground"] = fg
+            bg = light_bg if self._is_light else dark_bg
+            if bg:
+                opts["background"] = bg
+            self.tree.tag_configure(tag, **opts)
+            self._configured_tags.add(tag)
+        return (tag,)
 
     def create_context_menu(self, widget, is_entry=False):
         if is_entry:
-            menu = tk.Menu(self.root, tearoff=0)
-            menu.add_command(
-                label="貼上", command=lambda: widget.event_generate("<<Paste>>"))
-            menu.add_command(
-                label="全選", command=lambda: widget.event_generate("<<SelectAll>>"))
-            widget.bind("<Button-3>", lambda e: menu.post(e.x_root, e.y_root))
+            widget.bind("<Button-3>", lambda e: self._post_entry_menu(widget, e))
         else:
             self.tree_menu = tk.Menu(self.root, tearoff=0)
             self.tree_menu.add_command(
@@ -917,6 +1458,18 @@ class App:
             self.tree_menu.add_command(
                 label="🗑️ 刪除", command=self.delete_selected)
 
+    def _post_entry_menu(self, widget, event):
+        # 所有輸入框共用一個選單，第一次右鍵時才建立；指令作用於最後開啟選單的輸入框
+        if self._entry_menu is None:
+            menu = tk.Menu(self.root, tearoff=0)
+            menu.add_command(
+                label="貼上", command=lambda: self._entry_menu_target.event_generate("<<Paste>>"))
+            menu.add_command(
+                label="全選", command=lambda: self._entry_menu_target.event_generate("<<SelectAll>>"))
+            self._entry_menu = menu
+        self._entry_menu_target = widget
+        self._entry_menu.post(event.x_root, event.y_root)
+
     def show_tree_menu(self, event):
         item = self.tree.identify_row(event.y)
         if item:
@@ -939,17 +1492,41 @@ class App:
         self.log(f"🐞 除錯模式已{msg} (詳細錯誤將顯示於日誌)")
 
     def log(self, msg):
-        def _update():
-            ts = datetime.now().strftime("%H:%M:%S")
-            self.log_text.config(state='normal')
-            self.log_text.insert(tk.END, f"[{ts}] {msg}\n")
+        # 任何執行緒皆可呼叫；只放入緩衝 (deque.append 本身是執行緒安全的)，
+        # 不在此碰 Tk：寫入排程由主執行緒的 _drain_ui_updates 負責
+        # 同一秒內的訊息共用已格式化的時間字串；以整個 tuple 替換，跨執行緒讀寫也一致
+        sec = int(time.time())
+        ts = self._log_ts
+        if ts[0] != sec:
+            ts = self._log_ts = (sec, time.strftime("%H:%M:%S", time.localtime(sec)))
+        self._log_buffer.append(f"[{ts[1]}] {msg}\n")
+
+    def _flush_log(self):
+        # 先清除旗標再取出緩衝；之後才加入的訊息由下一輪 _drain_ui_updates 排程
+        self._log_flush_scheduled = False
+        buf = self._log_buffer
+        if not buf:
+            return
+        lines = []
+        while buf:
+            lines.append(buf.popleft())
+        text = "".join(lines)
+        self._log_lines += text.count("\n")
+        # 使用者往上捲動查看舊訊息時不自動捲到底，避免被新訊息拉回
+        follow = self.log_text.yview()[1] >= 1.0
+        self.log_text.config(state='normal')
+        self.log_text.insert(tk.END, text)
+        # 只保留最後 LOG_MAX_LINES 行，避免長時間執行時記憶體與重繪成本持續成長
+        if self._log_lines > LOG_MAX_LINES + LOG_TRIM_SLACK:
+            self.log_text.delete("1.0", f"end-{LOG_MAX_LINES + 1}l")
+            self._log_lines = LOG_MAX_LINES
+        if follow:
             self.log_text.see(tk.END)
-            self.log_text.config(state='disabled')
-        self.root.after(0, _update)
+        self.log_text.config(state='disabled')
 
     def start_sniff(self):
         url = self.url_var.get().strip()
-        if not url.startswith("http"):
+        if not url.startswith(("http://", "https://")):
             return self.log("⚠️ 請輸入正確網址")
         self.stop_event.clear()
         self.btn_start.config(state="disabled")
@@ -968,8 +1545,7 @@ class App:
             self.btn_start.config(state="normal")
             self.btn_stop.config(state="disabled")
             if result:
-                self.data_list.append(result)
-                self.refresh_tree()
+                self._append_items([result])
                 self.log(f"✅ 加入: {result['title']}")
                 self.url_var.set("")
             elif msg != "Stop":
@@ -979,10 +1555,8 @@ class App:
     def get_target_indices(self):
         sel = self.tree.selection()
         if sel:
-            return [int(iid) for iid in sel]
-        checked_indices = [i for i, d in enumerate(
-            self.data_list) if d.get('checked')]
-        return checked_indices
+            return [self._iid_to_idx[iid] for iid in sel]
+        return sorted(self._checked_indices)
 
     def check_validity_selected(self):
         target_indices = self.get_target_indices()
@@ -992,7 +1566,7 @@ class App:
         items_to_check = []
         for idx in target_indices:
             if idx < len(self.data_list):
-                items_to_check.append((idx, self.data_list[idx]))
+                items_to_check.append((self._row_iids[idx], self.data_list[idx]))
 
         self.stop_event.clear()
         self.log(f"🚀 開始檢查 {len(items_to_check)} 個連結...")
@@ -1013,7 +1587,7 @@ class App:
                 if not item.get("original_url"):
                     self.log(f"⚠️ 項目 {item['title']} 無法修復 (缺少原始網址)")
                 else:
-                    items_to_repair.append((idx, item))
+                    items_to_repair.append((self._row_iids[idx], item))
 
         if not items_to_repair:
             return messagebox.showwarning("無法修復", "所選項目均無原始網址紀錄，無法執行修復。")
@@ -1028,193 +1602,346 @@ class App:
                                self.log, self.stop_event, self.settings),
                          daemon=True).start()
 
-    def update_row_status(self, idx, status, tag=None, new_url=None, new_headers=None):
+    def update_row_status(self, iid, status, tag=None, new_url=None, new_headers=None):
+        # 背景工作以列的 iid 回報：工作期間若有列被刪除，位置會改變
         def _u():
-            if idx < len(self.data_list):
+            idx = self._iid_to_idx.get(iid)
+            if idx is not None:
                 self.data_list[idx]['status'] = status
                 if new_url:
                     self.data_list[idx]['m3u8'] = new_url
                 if new_headers:
                     self.data_list[idx]['headers'] = new_headers
-                self.refresh_row(idx, tag)
+                if new_url:
+                    self._refresh_row_url(idx)
+                self._refresh_row_status(idx, tag)
             if "任務結束" in status:
                 self.btn_stop.config(state="disabled")
-        self.root.after(0, _u)
+        self._ui_updates.append(_u)
+
+    def _drain_ui_updates(self):
+        # 每輪最多套用 UI_DRAIN_BATCH 筆，積壓時盡快接續下一輪，讓滑鼠/鍵盤事件有機會插隊
+        pending = self._ui_updates
+        delay = UI_DRAIN_INTERVAL_MS
+        try:
+            for _ in range(min(len(pending), UI_DRAIN_BATCH)):
+                pending.popleft()()
+            if pending:
+                delay = 1
+            # 背景執行緒的日誌只會進緩衝；在主執行緒上有訊息等待時才排程寫入
+            if self._log_buffer and not self._log_flush_scheduled:
+                self._log_flush_scheduled = True
+                self.root.after(LOG_FLUSH_INTERVAL_MS, self._flush_log)
+        finally:
+            self.root.after(delay, self._drain_ui_updates)
 
     def download_selected(self):
         target_indices = self.get_target_indices()
         if not target_indices:
             return self.log("⚠️ 未選擇項目 (請反白或打勾)")
 
-        path = self.settings.get(
-            "download_path", str(Path.home() / "Downloads"))
-        if not os.path.exists(path):
-            try:
-                os.makedirs(path)
-            except:
-                pass
+        path = self._download_path()
         for idx in target_indices:
             if idx >= len(self.data_list):
                 continue
             data = self.data_list[idx]
-            title = data['title']
-            if title in self.active_downloads:
+            # 以列的 iid 追蹤下載：標題可被使用者改名，iid 不會變
+            iid = self._row_iids[idx]
+            if iid in self.active_downloads:
                 continue
             stop_evt = threading.Event()
-            self.active_downloads[title] = stop_evt
-            self.update_row_status(idx, "準備中...", None)
+            self.active_downloads[iid] = stop_evt
+            # 已在主執行緒上，直接寫入，避免排在稍後的進度更新之後才生效
+            data['status'] = "準備中..."
+            self._refresh_row_status(idx, "")
 
             # 傳遞 settings 進去，以便讀取 debug_mode
             threading.Thread(target=download_task,
                              args=(
-                                 data['m3u8'], title, path, self.update_progress, self.log, stop_evt, data, self.settings),
+                                 data['m3u8'], data['title'], path,
+                                 lambda _title, val, iid=iid: self.update_progress(iid, val),
+                                 self.log, stop_evt, data, self.settings),
                              daemon=True).start()
 
     def stop_download_selected(self):
         target_indices = self.get_target_indices()
         for idx in target_indices:
-            title = self.data_list[idx]['title']
-            if title in self.active_downloads:
-                self.active_downloads[title].set()
+            stop_evt = self.active_downloads.get(self._row_iids[idx])
+            if stop_evt:
+                stop_evt.set()
 
-    def update_progress(self, title, val):
-        def _u():
-            idx = -1
-            for i, d in enumerate(self.data_list):
-                if d['title'] == title:
-                    idx = i
-                    break
-            if idx == -1:
+    def update_progress(self, iid, val):
+        with self._progress_lock:
+            self._pending_progress[iid] = val
+
+    def _progress_pump(self):
+        with self._progress_lock:
+            pending, self._pending_progress = self._pending_progress, {}
+        try:
+            for iid, val in pending.items():
+                self._apply_progress(iid, val)
+        finally:
+            self.root.after(PROGRESS_PUMP_INTERVAL_MS, self._progress_pump)
+
+    def _apply_progress(self, iid, val):
+        if val == 100 or val < 0:
+            # 下載已結束；即使該列已被刪除也要移除登記
+            self.active_downloads.pop(iid, None)
+        idx = self._iid_to_idx.get(iid)
+        if idx is None:
+            return
+        if val == 100:
+            self.data_list[idx]['status'] = "完成"
+            self._refresh_row_status(idx, "completed")
+        elif val < 0:
+            self.data_list[idx]['status'] = "停止" if val == -1 else "錯誤"
+            self._refresh_row_status(idx, "stopped" if val == -1 else "error")
+        else:
+            text = f"{val:.1f}%"
+            if self.data_list[idx]['status'] == text:
                 return
-            if val == 100:
-                self.data_list[idx]['status'] = "完成"
-                self.active_downloads.pop(title, None)
-                self.refresh_row(idx, "completed")
-            elif val < 0:
-                self.data_list[idx]['status'] = "停止" if val == -1 else "錯誤"
-                self.active_downloads.pop(title, None)
-                self.refresh_row(idx, "stopped" if val == -1 else "error")
-            else:
-                self.data_list[idx]['status'] = f"{val:.1f}%"
-                self.refresh_row(idx, "downloading")
-        self.root.after(0, _u)
+            self.data_list[idx]['status'] = text
+            self._refresh_row_status(idx, "downloading")
 
     def on_tree_click(self, event):
-        region = self.tree.identify_region(event.x, event.y)
-        if region == "cell" and self.tree.identify_column(event.x) == "#1":
-            iid = self.tree.identify_row(event.y)
+        # 多數點擊不在勾選欄，先以最便宜的欄位判斷排除，再查區域與列
+        tree = self.tree
+        if tree.identify_column(event.x) != "#1":
+            return
+        if tree.identify_region(event.x, event.y) == "cell":
+            iid = tree.identify_row(event.y)
             if iid:
-                idx = int(iid)
-                self.data_list[idx]['checked'] = not self.data_list[idx].get(
-                    'checked', False)
-                self.refresh_row(idx)
+                idx = self._iid_to_idx[iid]
+                checked = not self.data_list[idx]['checked']
+                self.data_list[idx]['checked'] = checked
+                if checked:
+                    self._checked_indices.add(idx)
+                else:
+                    self._checked_indices.discard(idx)
+                self._refresh_row_check(idx)
 
     def on_tree_double_click(self, event):
         if self.tree.identify_column(event.x) == "#2":
             iid = self.tree.identify_row(event.y)
             if iid:
-                idx = int(iid)
                 TitleEditorWindow(
-                    self.root, self.data_list[idx]['title'], lambda t: self.update_title(idx, t))
+                    self.root, self.data_list[self._iid_to_idx[iid]]['title'],
+                    lambda t: self.update_title(iid, t))
 
-    def update_title(self, idx, t):
+    def update_title(self, iid, t):
+        # 以 iid 定位：編輯視窗開啟期間若有列被刪除，位置可能已改變
+        idx = self._iid_to_idx.get(iid)
+        if idx is None:
+            return
         self.data_list[idx]['title'] = t
-        self.refresh_row(idx)
-
-    def refresh_tree(self):
-        self.tree.delete(*self.tree.get_children())
-        for i, item in enumerate(self.data_list):
-            self.tree.insert("", "end", iid=i, values=self._get_vals(item))
-            self._apply_tag(i, item.get('status', ''))
-
-    def refresh_row(self, idx, tag=None):
-        if 0 <= idx < len(self.data_list):
-            item = self.data_list[idx]
-            self.tree.item(idx, values=self._get_vals(item))
-            if tag:
-                self.tree.item(idx, tags=(tag,))
-            else:
-                self._apply_tag(idx, item.get('status', ''))
-
-    def _get_vals(self, item):
-        return ("☑" if item.get("checked") else "☐", item["title"], item.get("status", ""), item["m3u8"])
-
-    def _apply_tag(self, idx, status):
-        t = []
-        if "完成" in status:
-            t.append("completed")
-        elif "失效" in status or "錯誤" in status:
-            t.append("invalid")
-        elif "已修復" in status:
-            t.append("repaired")
-        elif "%" in status or "正在" in status:
-            t.append("downloading")
-        elif "停止" in status:
-            t.append("stopped")
-        self.tree.item(idx, tags=tuple(t))
+        self._refresh_row_title(idx)
+
+    def _append_items(self, new_items):
+        start = len(self.data_list)
+        self.data_list.extend(new_items)
+        for i, item in enumerate(new_items, start):
+            iid = str(next(self._iid_counter))
+            self._row_iids.append(iid)
+            self._iid_to_idx[iid] = i
+            # 補齊欄位，之後的列值計算可直接索引而不需 .get 預設值
+            item.setdefault('status', '')
+            item['checked'] = bool(item.get('checked'))
+            if item['checked']:
+                self._checked_indices.add(i)
+        self._insert_rows()
+
+    def _insert_rows(self):
+        # 只插入下一批尚未顯示的列；其餘留在 data_list，捲到底部附近時才補上
+        # (見 _tree_yscroll_proxy)，上萬筆的匯入不必一次全部交給 Tk
+        self._more_rows_scheduled = False
+        cache = self._row_cache
+        start = len(cache)
+        end = min(len(self.data_list), start + ROW_INSERT_BATCH)
+        # 緊湊迴圈：屬性查找先綁到區域變數
+        insert, get_row = self.tree.insert, self._get_row
+        iids = self._row_iids
+        for i, item in enumerate(itertools.islice(self.data_list, start, end), start):
+            row = get_row(item, iids[i])
+            insert("", "end", iid=iids[i], values=row[0], tags=row[1])
+            cache.append(row)
+
+    def _set_cell(self, idx, column, value):
+        # 只寫入單一欄位，且內容未變時不發出 Tcl 呼叫
+        if idx >= len(self._row_cache):
+            return  # 尚未插入的列，插入時會採用最新內容
+        vals, tags = self._row_cache[idx]
+        pos = _TREE_COL_POS[column]
+        if vals[pos] != value:
+            self.tree.set(self._row_iids[idx], column, value)
+            self._row_cache[idx] = (vals[:pos] + (value,) + vals[pos + 1:], tags)
+
+    def _set_row_tags(self, idx, tags):
+        if idx >= len(self._row_cache):
+            return
+        vals, old_tags = self._row_cache[idx]
+        if old_tags != tags:
+            self.tree.item(self._row_iids[idx], tags=tags)
+            self._row_cache[idx] = (vals, tags)
+
+    def _refresh_row_check(self, idx):
+        self._set_cell(idx, "check", CHECK_GLYPHS[self.data_list[idx]["checked"]])
+
+    def _refresh_row_title(self, idx):
+        self._set_cell(idx, "title", self.data_list[idx]["title"])
+
+    def _refresh_row_url(self, idx):
+        self._set_cell(idx, "m3u8", self.data_list[idx]["m3u8"])
+
+    def _refresh_row_status(self, idx, tag=None):
+        iid = self._row_iids[idx]
+        status = self.data_list[idx]["status"]
+        # 呼叫端已知標籤時直接套用 ("" 代表無標籤)；None 才從狀態文字推斷
+        if tag is None:
+            tag = _status_to_tag(status)
+        # 記下最後的標籤：尚未插入的列插入時沿用，不再從狀態文字重新推斷
+        self._row_tag[iid] = tag
+        if idx >= len(self._row_cache):
+            return
+        if time.monotonic() < self._scroll_until:
+            # 使用者正在捲動：只記下該列，停下後再一次補上
+            if not self._dirty_rows:
+                self.root.after(SCROLL_FLUSH_INTERVAL_MS, self._flush_dirty_rows)
+            self._dirty_rows[iid] = tag
+            return
+        self._set_cell(idx, "status", status)
+        self._set_row_tags(idx, self._row_tags(tag))
+
+    def _flush_dirty_rows(self):
+        if time.monotonic() < self._scroll_until:
+            self.root.after(SCROLL_FLUSH_INTERVAL_MS, self._flush_dirty_rows)
+            return
+        dirty, self._dirty_rows = self._dirty_rows, {}
+        for iid, tag in dirty.items():
+            idx = self._iid_to_idx.get(iid)
+            if idx is not None:
+                self._refresh_row_status(idx, tag)
+
+    def _get_row(self, item, iid):
+        # 一次算出插入/比對所需的 (values, tags)，insert 時直接帶入標籤
+        status = item["status"]
+        vals = (CHECK_GLYPHS[item["checked"]], item["title"], status, item["m3u8"])
+        tag = self._row_tag.get(iid)
+        if tag is None:
+            tag = _status_to_tag(status)
+        return vals, self._row_tags(tag)
 
     def toggle_all_checks(self):
         if not self.data_list:
             return
-        ns = not self.data_list[0].get('checked', False)
-        for d in self.data_list:
+        ns = not self.data_list[0]['checked']
+        # 只改勾選欄，不動其他欄位與標籤
+        for i, d in enumerate(self.data_list):
             d['checked'] = ns
-        self.refresh_tree()
+            self._refresh_row_check(i)
+        self._checked_indices = set(range(len(self.data_list))) if ns else set()
 
     def delete_selected(self):
         target_indices = self.get_target_indices()
         if not target_indices:
             return self.log("⚠️ 未選擇刪除項目")
 
-        for i in sorted(target_indices, reverse=True):
-            if i < len(self.data_list):
-                del self.data_list[i]
-        self.refresh_tree()
+        # 只從 Treeview 移除被刪的列 (尚未插入的列不必處理)
+        targets = set(target_indices)
+        shown = len(self._row_cache)
+        self.tree.delete(*[self._row_iids[i] for i in targets if i < shown])
+        for i in targets:
+            self._row_tag.pop(self._row_iids[i], None)
+
+        # 單次走訪保留的列，同時重建各項索引
+        keep, keep_iids, keep_cache = [], [], []
+        iid_to_idx = {}
+        checked = set()
+        for i, d in enumerate(self.data_list):
+            if i in targets:
+                continue
+            n = len(keep)
+            keep.append(d)
+            iid = self._row_iids[i]
+            keep_iids.append(iid)
+            iid_to_idx[iid] = n
+            if i < shown:
+                keep_cache.append(self._row_cache[i])
+            if d['checked']:
+                checked.add(n)
+        self.data_list[:] = keep
+        self._row_iids = keep_iids
+        self._row_cache[:] = keep_cache
+        self._iid_to_idx = iid_to_idx
+        self._checked_indices = checked
 
     def copy_title(self):
         s = self.tree.selection()
         if s:
             self.root.clipboard_clear()
-            self.root.clipboard_append(self.data_list[int(s[0])]['title'])
+            self.root.clipboard_append(self.data_list[self._iid_to_idx[s[0]]]['title'])
 
     def copy_m3u8(self):
         s = self.tree.selection()
         if s:
             self.root.clipboard_clear()
-            self.root.clipboard_append(self.data_list[int(s[0])]['m3u8'])
+            self.root.clipboard_append(self.data_list[self._iid_to_idx[s[0]]]['m3u8'])
+
+    def _download_path(self):
+        # 路徑未變更時不再重複檢查/建立資料夾
+        path = self.settings.get("download_path", str(Path.home() / "Downloads"))
+        if path != self._download_dir:
+            try:
+                Path(path).mkdir(parents=True, exist_ok=True)
+                self._download_dir = path
+            except:
+                pass
+        return path
 
     def open_download_folder(self):
-        p = self.settings.get("download_path", str(Path.home() / "Downloads"))
-        if os.path.exists(p):
-            os.startfile(p)
+        p = self._download_path()
+        if p == self._download_dir:
+            try:
+                os.startfile(p)
+            except OSError:
+                self._download_dir = None  # 資料夾已被移除，下次重新建立
 
     def import_json(self):
         p = filedialog.askopenfilename(filetypes=[("JSON Data", "*.json")])
         if not p:
             return
-        try:
-            with open(p, 'r', encoding='utf-8') as f:
-                new_data = json.load(f)
-                self.data_list.extend(new_data)
-            self.refresh_tree()
-            self.log(f"📂 JSON 匯入成功: {os.path.basename(p)}")
-        except Exception as e:
-            self.log(f"❌ JSON 載入失敗: {e}")
-            messagebox.showerror("錯誤", f"JSON 載入失敗：\n{e}")
+        name = os.path.basename(p)
+        self._import_async(p, _read_json_file, "JSON 載入",
+                           lambda items: f"📂 JSON 匯入成功: {name}")
 
     def import_m3u(self):
         p = filedialog.askopenfilename(
             filetypes=[("M3U Playlist", "*.m3u;*.m3u8")])
         if not p:
             return
-        try:
-            items = M3UHandler.parse_file(p)
-            self.data_list.extend(items)
-            self.refresh_tree()
-            self.log(f"📂 M3U 匯入成功: {os.path.basename(p)} ({len(items)} 項目)")
-        except Exception as e:
-            self.log(f"❌ M3U 解析失敗: {e}")
-            messagebox.showerror("錯誤", f"M3U 解析失敗：\n{e}")
+        name = os.path.basename(p)
+        self._import_async(p, M3UHandler.parse_file, "M3U 解析",
+                           lambda items: f"📂 M3U 匯入成功: {name} ({len(items)} 項目)")
+
+    def _import_async(self, path, parse, label, done_msg):
+        # 讀檔與解析在背景執行緒進行，結果經由更新佇列交回主執行緒插入
+        def work():
+            try:
+                items, err = parse(path), None
+            except Exception as e:
+                items, err = None, e
+            self._ui_updates.append(
+                lambda: self._finish_import(items, err, label, done_msg))
+        threading.Thread(target=work, daemon=True).start()
+
+    def _finish_import(self, items, err, label, done_msg):
+        if err is None:
+            try:
+                self._append_items(items)
+                return self.log(done_msg(items))
+            except Exception as e:
+                err = e
+        self.log(f"❌ {label}失敗: {err}")
+        messagebox.showerror("錯誤", f"{label}失敗：\n{err}")
 
     def export_json(self):
         if not self.data_list:
@@ -1224,8 +1951,10 @@ class App:
         if not p:
             return
         try:
-            with open(p, 'w', encoding='utf-8') as f:
-                json.dump(self.data_list, f, ensure_ascii=False, indent=2)
+            # 先整份序列化再一次寫入 (有 orjson 時走 C 實作)
+            data = json_dumps(self.data_list)
+            with open(p, 'wb') as f:
+                f.write(data)
             self.log("💾 JSON 匯出成功")
         except Exception as e:
             self.log(f"❌ JSON 儲存失敗: {e}")
@@ -1255,4 +1984,9 @@ if __name__ == "__main__":
     theme = temp_settings.get("theme", "cosmo")
     root = ttk.Window(themename=theme)
     app = App(root)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        DRIVER_POOL.shutdown()
+        YDL_POOL.shutdown()
+        _remove_driver_copies()
@@ -0,0 +1,153 @@
+import collections
+import itertools
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+try:
+    import media_sniffer as ms
+except ImportError as e:  # GUI/瀏覽器相依套件未安裝時略過
+    raise unittest.SkipTest(f"media_sniffer 無法匯入: {e}")
+
+
+class FakeTree:
+    """只記錄列內容的 Treeview 替身。"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def insert(self, parent, index, iid=None, values=(), tags=()):
+        self.rows[iid] = {"values": tuple(values), "tags": tuple(tags)}
+        return iid
+
+    def set(self, iid, column, value):
+        vals = list(self.rows[iid]["values"])
+        vals[ms.TREE_COLUMNS.index(column)] = value
+        self.rows[iid]["values"] = tuple(vals)
+
+    def item(self, iid, tags=None, **kw):
+        if tags is not None:
+            self.rows[iid]["tags"] = tuple(tags)
+
+    def delete(self, *iids):
+        for iid in iids:
+            del self.rows[iid]
+
+    def tag_configure(self, *a, **kw):
+        pass
+
+
+class FakeRoot:
+    def after(self, ms_, fn=None, *a):
+        pass
+
+    def after_idle(self, fn, *a):
+        pass
+
+
+def make_app():
+    app = ms.App.__new__(ms.App)
+    app.root, app.tree = FakeRoot(), FakeTree()
+    app.data_list, app._row_cache = [], []
+    app._row_iids, app._iid_to_idx, app._row_tag = [], {}, {}
+    app._iid_counter = itertools.count()
+    app._checked_indices, app._configured_tags = set(), set()
+    app._is_light = True
+    app._ui_updates, app._log_buffer = collections.deque(), collections.deque()
+    app._log_flush_scheduled = False
+    app._pending_progress, app._progress_lock = {}, threading.Lock()
+    app._scroll_until, app._scroll_top, app._dirty_rows = 0.0, None, {}
+    app._more_rows_scheduled = False
+    app.active_downloads = {}
+    return app
+
+
+def make_items(n):
+    return [{"title": f"T{i}", "m3u8": f"http://x/{i}.m3u8"} for i in range(n)]
+
+
+class LazyRowTagTest(unittest.TestCase):
+    def test_status_tag_survives_until_row_is_inserted(self):
+        app = make_app()
+        app._append_items(make_items(ms.ROW_INSERT_BATCH + 3))
+        last = len(app.data_list) - 1
+        iid = app._row_iids[last]
+        self.assertNotIn(iid, app.tree.rows)
+
+        # 尚未插入的列收到明確標籤：文字本身推斷不出 (或推斷成別的) 標籤
+        app.update_row_status(iid, "錯誤", "error")
+        app._drain_ui_updates()
+        self.assertNotIn(iid, app.tree.rows)
+
+        app._insert_rows()
+        self.assertEqual(app.tree.rows[iid]["values"][2], "錯誤")
+        self.assertEqual(app.tree.rows[iid]["tags"], ("error",))
+
+
+
+class RowIdentityTest(unittest.TestCase):
+    def test_worker_update_follows_row_after_delete(self):
+        app = make_app()
+        app._append_items(make_items(3))
+        target = app._row_iids[2]
+        app.get_target_indices = lambda: [0]
+        app.delete_selected()
+
+        # 工作啟動時記下的是 iid；刪除後列位置改變，更新仍須落在原本那一列
+        app.update_row_status(target, "✅ 已修復", "repaired", new_url="http://new")
+        app._drain_ui_updates()
+        self.assertEqual([d["m3u8"] for d in app.data_list],
+                         ["http://x/1.m3u8", "http://new"])
+
+        # 已被刪除的列：更新直接略過
+        gone = app._row_iids[0]
+        app.get_target_indices = lambda: [0]
+        app.delete_selected()
+        app.update_row_status(gone, "✅ 已修復", "repaired", new_url="http://other")
+        app._drain_ui_updates()
+        self.assertEqual([d["m3u8"] for d in app.data_list], ["http://new"])
+
+
+
+class ScrollDetectionTest(unittest.TestCase):
+    def test_appending_rows_is_not_a_scroll(self):
+        app = make_app()
+        app._append_items(make_items(100))
+        scrollbar = type("Bar", (), {"set": lambda self, first, last: None})()
+        yscroll = app._tree_yscroll_proxy(scrollbar)
+        yscroll("0.5", "0.6")  # 頂端在第 50 列
+        app._scroll_until = 0.0
+
+        # 追加 100 列：first 變成 50/200，但頂端列沒動
+        app._append_items(make_items(100))
+        yscroll("0.25", "0.3")
+        self.assertEqual(app._scroll_until, 0.0)
+
+        yscroll("0.3", "0.35")  # 真的往下捲
+        self.assertGreater(app._scroll_until, 0.0)
+
+
+class JsonImportValidationTest(unittest.TestCase):
+    def _read(self, payload):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        return ms._read_json_file(path)
+
+    def test_rejects_malformed_files(self):
+        for payload in ({"title": "x"}, None, ["x"], [{"title": "x"}],
+                        [{"title": "x", "m3u8": "u", "status": 1}]):
+            with self.subTest(payload=payload):
+                with self.assertRaises(ValueError):
+                    self._read(payload)
+
+    def test_accepts_exported_items(self):
+        items = [{"title": "x", "m3u8": "u", "status": "", "checked": True}]
+        self.assertEqual(self._read(items), items)
+
+
+if __name__ == "__main__":
+    unittest.main()